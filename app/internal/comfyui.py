@@ -6,7 +6,7 @@ ComfyUI 客户端模块
 
 import httpx
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union, BinaryIO
 
 from app.config import settings
 from app.exceptions import ComfyUIConnectionError, ImageNotFoundError
@@ -131,11 +131,21 @@ class ComfyUIClient:
 
     async def upload_image(
             self,
-            image_data: bytes,
+            image_data: Union[bytes, BinaryIO],
             filename: str,
             overwrite: bool = True
     ) -> Dict[str, Any]:
-        """上传图片"""
+        """
+        上传图片
+
+        Args:
+            image_data: 图片内容，传入文件对象时由 httpx 分块流式发送
+            filename: 文件名
+            overwrite: 是否覆盖同名文件
+
+        Returns:
+            ComfyUI 响应
+        """
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 files = {"image": (filename, image_data, "image/png")}
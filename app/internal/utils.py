@@ -3,20 +3,56 @@
 """
 
 import json
+import shutil
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO, Optional
 from copy import deepcopy
 
 
-def save_file(content: bytes, filename: str, directory: Path) -> str:
-    """保存文件到目录"""
+# 识别图片类型所需读取的文件头字节数
+MIME_SNIFF_SIZE = 512
+
+# 图片文件头魔数
+_IMAGE_SIGNATURES = {
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"\xff\xd8\xff": "image/jpeg",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+    b"BM": "image/bmp",
+}
+
+
+def save_file(file: BinaryIO, filename: str, directory: Path) -> str:
+    """
+    保存文件到目录
+
+    按块从文件对象复制到磁盘，不会将整个文件读入内存
+    """
     directory.mkdir(parents=True, exist_ok=True)
     file_path = directory / filename
     with open(file_path, "wb") as f:
-        f.write(content)
+        shutil.copyfileobj(file, f)
     return str(file_path)
 
 
+def sniff_mime(head: bytes) -> Optional[str]:
+    """
+    根据文件头魔数识别图片类型
+
+    Args:
+        head: 文件开头的字节（不超过 MIME_SNIFF_SIZE 即可）
+
+    Returns:
+        图片 MIME 类型，无法识别时返回 None
+    """
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime_type in _IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return mime_type
+    return None
+
+
 def read_file(file_path: Path) -> bytes:
     """读取文件"""
     with open(file_path, "rb") as f:
@@ -4,10 +4,11 @@
 from typing import Dict, Any
 
 from fastapi import APIRouter, UploadFile, File, Form, Response, HTTPException
+from starlette.concurrency import run_in_threadpool
 
 from app.internal.comfyui import comfyui_client
 from app.config import settings
-from app.internal.utils import save_file
+from app.internal.utils import save_file, sniff_mime, MIME_SNIFF_SIZE
 from app.schemas import ApiResponse
 
 router = APIRouter(prefix="/images", tags=["images"])
@@ -24,19 +25,30 @@ async def upload_image(
     参数:
     - file: 图片文件
     - overwrite: 是否覆盖同名文件 (默认: True)
-    """
-    content = await file.read()
 
+    文件内容不会整体读入内存：本地保存和转发到 ComfyUI 都按块进行
+    """
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="只支持图片文件")
 
-    # 保存到本地
-    save_file(content, file.filename, settings.INPUT_DIR)
+    # 只读取文件头校验真实类型，不读取整个文件；空文件同样拒绝
+    head = await file.read(MIME_SNIFF_SIZE)
+    if not head or sniff_mime(head) is None:
+        raise HTTPException(status_code=400, detail="只支持图片文件")
+    await file.seek(0)
+
+    # 保存到本地（分块写入，放到线程池避免阻塞事件循环）
+    await run_in_threadpool(save_file, file.file, file.filename, settings.INPUT_DIR)
 
-    # 上传到 ComfyUI
-    await comfyui_client.upload_image(content, file.filename, overwrite)
+    # 上传到 ComfyUI（以文件对象流式转发）
+    await file.seek(0)
+    result = await comfyui_client.upload_image(file.file, file.filename, overwrite)
 
     return ApiResponse.success(
+        data={
+            "filename": file.filename,
+            "name": result.get("name", file.filename)
+        },
         message="上传成功"
     )
 
@@ -5,11 +5,15 @@ Pytest 配置和共享 Fixtures
 """
 
 import asyncio
+import os
 import pytest
+import pytest_asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import AsyncGenerator
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 from app.main import create_app
 from app.internal.comfyui import ComfyUIClient
@@ -19,11 +23,12 @@ from app.exceptions import register_exception_handlers
 # ============ 应用 Fixtures ============
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
     """
     创建 FastAPI 测试应用实例
 
+    整个测试会话只创建一次（应用本身无状态，测试只替换路由模块中的 comfyui_client）。
     跳过 lifespan 事件但保留异常处理器
     """
     # 创建空 lifespan 来跳过初始化
@@ -41,28 +46,69 @@ def app():
     yield app_instance
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app) -> TestClient:
     """
     创建测试客户端
 
-    提供用于 HTTP 请求测试的 TestClient 实例
+    提供用于 HTTP 请求测试的 TestClient 实例。
+    整个测试会话共用一个实例，避免每个测试重复创建 portal 线程；
+    路由在请求时才读取模块中的 comfyui_client，因此测试中的 mock 替换对共享客户端同样生效
     """
     with TestClient(app) as test_client:
         yield test_client
 
 
+@pytest_asyncio.fixture
+async def async_client(app) -> AsyncGenerator[AsyncClient, None]:
+    """
+    创建异步测试客户端
+
+    通过 ASGITransport 在测试自身的事件循环中直接调用应用，
+    不需要 TestClient 为每个测试创建线程和 portal。
+    未处理异常由全局异常处理器转换为 500 响应，而不是抛到测试中。
+    """
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(app):
+    """
+    提供 OpenAPI schema 字典
+
+    整个测试会话只生成一次，供只检查 schema 内容的测试共享；
+    OpenAPI 接口本身的 HTTP 访问由 test_openapi_schema 单独覆盖
+    """
+    return app.openapi()
+
+
 # ============ ComfyUI Client Mock Fixtures ============
 
 
+@pytest.fixture(scope="session")
+def _shared_comfyui_client():
+    """
+    整个测试会话共用的 ComfyUI 客户端 mock 实例
+
+    使用 create_autospec 按 ComfyUIClient 自动生成：async 方法为 AsyncMock，
+    其余属性为普通 MagicMock；调用时还会校验参数签名，访问不存在的属性直接报错
+    """
+    return create_autospec(ComfyUIClient, instance=True)
+
+
 @pytest.fixture
-def mock_comfyui_client():
+def mock_comfyui_client(_shared_comfyui_client):
     """
     Mock ComfyUI 客户端
 
-    提供所有 ComfyUI 方法的 mock 实现
+    提供所有 ComfyUI 方法的 mock 实现。
+    复用会话级 mock 实例，每个测试开始前重置调用记录、返回值和 side_effect，
+    再设置默认返回值，测试之间不会互相影响
     """
-    mock_client = AsyncMock(spec=ComfyUIClient)
+    mock_client = _shared_comfyui_client
+    mock_client.reset_mock(return_value=True, side_effect=True)
 
     # submit_prompt 方法默认返回值
     mock_client.submit_prompt.return_value = "test-prompt-id-123"
@@ -105,6 +151,50 @@ def mock_queue_status_data():
     }
 
 
+@pytest.fixture(scope="session")
+def large_queue_status_data():
+    """
+    提供测试用的大队列状态数据（运行中、等待中各 50 项）
+
+    整个测试会话只构造一次，测试中不要修改
+    """
+    return {
+        "queue_running": [[i, f"running-{i}", 1234567890 + i] for i in range(50)],
+        "queue_pending": [[i, f"pending-{i}", 1234567890 + i] for i in range(50, 100)]
+    }
+
+
+@pytest.fixture(scope="session")
+def malformed_queue_status_data():
+    """
+    提供测试用的格式错误队列数据
+
+    队列项长度小于 3 时应被过滤，只有 1 个运行中的队列项有效
+    """
+    return {
+        "queue_running": [
+            [1, "prompt-1", 1234567890],  # 正常
+            [2, "prompt-2"],  # 格式错误（缺少时间戳）
+        ],
+        "queue_pending": [
+            [3],  # 格式错误（只有编号）
+        ]
+    }
+
+
+@pytest.fixture(scope="session")
+def special_chars_queue_status_data():
+    """
+    提供测试用的包含特殊字符 prompt_id 的队列数据
+    """
+    return {
+        "queue_running": [
+            [1, "prompt-with-特殊字符-中文", 1234567890],
+        ],
+        "queue_pending": []
+    }
+
+
 @pytest.fixture
 def mock_history_data():
     """
@@ -141,13 +231,81 @@ def mock_workflow_data():
 # ============ 图片测试 Fixtures ============
 
 
+# 图片数据在模块加载时只生成一次；bytes 不可变，可安全地在测试间共享
+# 最小 PNG 图片的二进制数据
+_SMALL_PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\x0d\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82"
+# 大图片大小（MB），可通过环境变量 TEST_UPLOAD_SIZE_MB 调整，默认 10MB
+_LARGE_PNG_SIZE = int(os.getenv("TEST_UPLOAD_SIZE_MB", "10")) * 1024 * 1024
+
+
 @pytest.fixture
 def mock_image_content():
     """
     提供测试用的图片二进制数据
     """
-    # 返回一个最小 PNG 图片的二进制数据
-    return b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\x0d\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82"
+    return _SMALL_PNG
+
+
+@pytest.fixture(scope="session")
+def large_image_content():
+    """
+    提供测试用的大图片二进制数据
+
+    大小由 TEST_UPLOAD_SIZE_MB 决定（默认 10MB）；在 fixture 中按需分配，
+    以 `-m "not slow"` 运行时不会产生这部分内存开销。
+    """
+    return b"\x89PNG\r\n\x1a\n" + bytes(_LARGE_PNG_SIZE)
+
+
+_MULTIPART_BOUNDARY = "fastapi-comfyui-test-boundary"
+
+
+# 超过该大小的上传内容不进入缓存，避免大文件请求体在整个会话（及每个 xdist worker）中常驻内存
+_UPLOAD_FORM_CACHE_LIMIT = 1024 * 1024
+
+
+@lru_cache(maxsize=8)
+def _encode_upload_form(filename, content, content_type, overwrite=None):
+    """
+    编码上传图片的 multipart/form-data 请求体
+
+    小请求体按参数缓存（最多 8 个），重复的上传请求不必重新编码；
+    超过 _UPLOAD_FORM_CACHE_LIMIT 的内容由 upload_form 绕过缓存直接编码
+
+    Returns:
+        (请求体字节, Content-Type 请求头)
+    """
+    parts = []
+    if overwrite is not None:
+        parts.append(
+            f"--{_MULTIPART_BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="overwrite"\r\n\r\n'
+            f"{overwrite}\r\n".encode("utf-8")
+        )
+    parts.append(
+        f"--{_MULTIPART_BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n".encode("utf-8")
+    )
+    parts.append(content)
+    parts.append(f"\r\n--{_MULTIPART_BOUNDARY}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={_MULTIPART_BOUNDARY}"
+
+
+@pytest.fixture(scope="session")
+def upload_form():
+    """
+    提供上传图片请求参数的构造函数
+
+    返回可直接展开到 client.post() 的 content/headers 参数，
+    用法: client.post(url, **upload_form("test.png", content, "image/png", overwrite="true"))
+    """
+    def build(filename, content, content_type="image/png", overwrite=None):
+        encode = _encode_upload_form if len(content) <= _UPLOAD_FORM_CACHE_LIMIT else _encode_upload_form.__wrapped__
+        body, header = encode(filename, content, content_type, overwrite)
+        return {"content": body, "headers": {"content-type": header}}
+
+    return build
 
 
 @pytest.fixture
@@ -169,22 +327,6 @@ def mock_upload_file(mock_image_content):
 # ============ 测试数据 Fixtures ============
 
 
-@pytest.fixture
-def valid_workflow_submit_request():
-    """
-    有效的工作流提交请求
-    """
-    return {
-        "workflow": {
-            "1": {
-                "class_type": "KSampler",
-                "inputs": {"seed": 123456789}
-            }
-        },
-        "client_id": "test-client-1"
-    }
-
-
 @pytest.fixture
 def valid_cpu_quickly_request():
     """
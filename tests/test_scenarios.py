@@ -4,67 +4,115 @@
 测试 /api/v1/scenarios/* 相关接口
 """
 
-import pytest
-from unittest.mock import AsyncMock, patch
+import asyncio
 import json
+from types import MappingProxyType
+from unittest.mock import patch
 
+import pytest
 
-class TestScenariosCPUQuickly:
-    """测试 CPU Quickly 图生图接口 POST /api/v1/scenarios/cpu_quickly"""
+from app.exceptions import (
+    ComfyUIConnectionError,
+    FileOperationError,
+    ImageNotFoundError,
+    QueueOperationError,
+    WorkflowValidationError,
+)
+from app.routers.scenarios import Img2ImgRequest, cpu_quickly
+from app.schemas import ResponseCode
 
-    def test_cpu_quickly_success(self, client, mock_comfyui_client, valid_cpu_quickly_request):
-        """
-        测试成功执行 CPU Quickly 场景
-        """
-        mock_comfyui_client.submit_prompt.return_value = "test-prompt-id-123"
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=valid_cpu_quickly_request)
+# 使用 pytest -n auto --dist loadgroup 时，本模块的测试固定在同一个 worker 上执行
+pytestmark = pytest.mark.xdist_group("scenarios")
 
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == 200
-            assert result["message"] == "图生图任务已提交"
-            assert "prompt_id" in result["data"]
-            assert result["data"]["scenario"] == "cpu_quickly"
-            mock_comfyui_client.submit_prompt.assert_called_once()
+# 业务错误码别名，供参数化列表使用
+ERR_CONN = ResponseCode.ERROR_COMFYUI_CONNECTION
+ERR_WORKFLOW = ResponseCode.ERROR_WORKFLOW_VALIDATION
+ERR_QUEUE = ResponseCode.ERROR_QUEUE_OPERATION
+ERR_FILE = ResponseCode.ERROR_FILE_OPERATION
+ERR_IMAGE_NOT_FOUND = ResponseCode.ERROR_IMAGE_NOT_FOUND
 
-    def test_cpu_quickly_with_negative_prompt(self, client, mock_comfyui_client):
-        """
-        测试包含负面提示词的请求
-        """
-        request_data = {
-            "prompt": "a beautiful landscape",
-            "negative_prompt": "ugly, blurry, low quality",
-            "input_image": "test.png"
-        }
+_JSON_HEADERS = {"content-type": "application/json"}
 
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
+# 基础请求体：只包含必填字段，其余使用默认值；只读，使用时以 dict(_BASIC_REQ, ...) 复制
+_BASIC_REQ = MappingProxyType({"prompt": "test"})
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+# 超长字符串用例数据，模块加载时只构造一次
+_LONG_PROMPT = "x" * 10000
+_LONG_A = "x" * 5000
+_LONG_B = "y" * 5000
+_LONG_IMG = "a" * 200 + ".png"
+
+
+def _cpu_quickly_body(prompt, negative_prompt="", input_image="test.png"):
+    """
+    构造预序列化的 cpu_quickly 请求体
+
+    在收集阶段只序列化一次，参数化用例直接以 content= 发送，不必每次请求都重新编码
+    """
+    return json.dumps({
+        "prompt": prompt,
+        "negative_prompt": negative_prompt,
+        "input_image": input_image
+    }).encode()
 
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == 200
 
-    def test_cpu_quickly_without_negative_prompt(self, client, mock_comfyui_client):
+@pytest.fixture(autouse=True)
+def patch_comfyui_client(monkeypatch, mock_comfyui_client):
+    """
+    将场景路由使用的 comfyui_client 替换为 mock
+
+    每个测试只做一次属性替换，测试体内无需再使用 patch 上下文
+    """
+    monkeypatch.setattr("app.routers.scenarios.comfyui_client", mock_comfyui_client)
+    return mock_comfyui_client
+
+
+class TestScenariosCPUQuickly:
+    """测试 CPU Quickly 图生图接口 POST /api/v1/scenarios/cpu_quickly"""
+
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_success(self, async_client, mock_comfyui_client, valid_cpu_quickly_request):
         """
-        测试不提供负面提示词（使用默认值）
+        测试成功执行 CPU Quickly 场景
         """
-        request_data = {
-            "prompt": "a beautiful landscape",
-            "input_image": "test.png"
-        }
+        mock_comfyui_client.submit_prompt.return_value = "test-prompt-id-123"
 
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=valid_cpu_quickly_request)
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["code"] == 200
+        assert result["message"] == "图生图任务已提交"
+        assert "prompt_id" in result["data"]
+        assert result["data"]["scenario"] == "cpu_quickly"
+        mock_comfyui_client.submit_prompt.assert_called_once()
+
+    @pytest.mark.parametrize("request_data", [
+        {"prompt": "a beautiful landscape", "negative_prompt": "ugly, blurry, low quality", "input_image": "test.png"},
+        {"prompt": "a beautiful landscape", "input_image": "test.png"},
+        {"prompt": "测试 prompt with 特殊字符!@#$%", "negative_prompt": "避免的", "input_image": "测试图片.png"},
+        {"prompt": "a beautiful landscape 🌄✨", "negative_prompt": "ugly 😖", "input_image": "test.png"},
+        # 空字符串是有效的默认值
+        {"prompt": "test", "negative_prompt": "", "input_image": ""},
+    ], ids=["with_negative_prompt", "without_negative_prompt", "special_characters", "unicode_emoji", "empty_input_image"])
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_payload_variants(self, async_client, mock_comfyui_client, request_data):
+        """
+        参数化测试：不同请求体组合
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        验证点:
+        - 负面提示词可省略（使用默认值）
+        - 支持中文、特殊字符和 emoji
+        - 输入图片文件名可为空字符串
+        """
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
 
-            assert response.status_code == 200
+        assert response.status_code == 200
+        assert response.json()["code"] == 200
 
-    def test_cpu_quickly_missing_required_field(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_missing_required_field(self, async_client, mock_comfyui_client):
         """
         测试缺少必填字段
         """
@@ -74,12 +122,12 @@ class TestScenariosCPUQuickly:
             "input_image": "test.png"
         }
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
 
-            assert response.status_code == 400
+        assert response.status_code == 400
 
-    def test_cpu_quickly_template_not_found(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_template_not_found(self, async_client, mock_comfyui_client):
         """
         测试 workflow 模板文件不存在
 
@@ -87,25 +135,21 @@ class TestScenariosCPUQuickly:
         - FileNotFoundError 被全局异常处理器捕获
         - 返回 500 错误码
         """
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
+        request_data = dict(_BASIC_REQ)
 
         # 使用 patch 替换 load_cpu_quickly_workflow，使其抛出 FileNotFoundError
         with patch("app.routers.scenarios.load_cpu_quickly_workflow") as mock_load:
             mock_load.side_effect = FileNotFoundError("模板文件不存在")
 
-            with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-                response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+            response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
 
-                assert response.status_code == 500
-                result = response.json()
-                assert result["code"] == 500
-                assert result["message"] == "服务器内部错误"
+            assert response.status_code == 500
+            result = response.json()
+            assert result["code"] == 500
+            assert result["message"] == "服务器内部错误"
 
-    def test_cpu_quickly_submit_exception(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_submit_exception(self, async_client, mock_comfyui_client):
         """
         测试提交工作流时发生异常
 
@@ -115,330 +159,144 @@ class TestScenariosCPUQuickly:
         """
         mock_comfyui_client.submit_prompt.side_effect = Exception("提交失败")
 
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
+        request_data = dict(_BASIC_REQ)
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
 
-            assert response.status_code == 500
-            result = response.json()
-            assert result["code"] == 500
-            assert result["message"] == "服务器内部错误"
+        assert response.status_code == 500
+        result = response.json()
+        assert result["code"] == 500
+        assert result["message"] == "服务器内部错误"
 
-    @pytest.mark.parametrize("prompt,expected_valid", [
-        ("a beautiful landscape", True),
-        ("1girl, anime style, detailed", True),
-        ("", True),  # 空提示词可能有效
-        ("x" * 10000, True),  # 长提示词
+    @pytest.mark.parametrize("body", [
+        pytest.param(_cpu_quickly_body("a beautiful landscape"), id="normal"),
+        pytest.param(_cpu_quickly_body("1girl, anime style, detailed"), id="anime"),
+        pytest.param(_cpu_quickly_body(""), id="empty"),  # 空提示词可能有效
+        pytest.param(_cpu_quickly_body(_LONG_PROMPT), id="long"),  # 长提示词
     ])
-    def test_cpu_quickly_various_prompts(self, client, mock_comfyui_client, prompt, expected_valid):
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_various_prompts(self, async_client, mock_comfyui_client, body):
         """
         参数化测试：不同类型的提示词
         """
-        request_data = {
-            "prompt": prompt,
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
-
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
-
-    def test_cpu_quickly_with_special_characters(self, client, mock_comfyui_client):
-        """
-        测试包含特殊字符的提示词
-        """
-        request_data = {
-            "prompt": "测试 prompt with 特殊字符!@#$%",
-            "negative_prompt": "避免的",
-            "input_image": "测试图片.png"
-        }
-
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", content=body, headers=_JSON_HEADERS)
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
+        assert response.status_code == 200
 
 
 class TestScenariosEdgeCases:
     """场景接口边界情况测试"""
 
-    def test_cpu_quickly_empty_input_image(self, client, mock_comfyui_client):
-        """
-        测试空的输入图片文件名
-        """
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": ""
-        }
-
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            # 空字符串是有效的默认值
-            assert response.status_code == 200
-
-    def test_cpu_quickly_with_unicode_emoji(self, client, mock_comfyui_client):
-        """
-        测试包含 emoji 的提示词
-        """
-        request_data = {
-            "prompt": "a beautiful landscape 🌄✨",
-            "negative_prompt": "ugly 😖",
-            "input_image": "test.png"
-        }
-
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
-
-    def test_cpu_quickly_workflow_parameters(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_workflow_parameters(self, mock_comfyui_client):
         """
         测试 workflow 参数正确应用
-        """
-        request_data = {
-            "prompt": "test prompt",
-            "negative_prompt": "test negative",
-            "input_image": "test_image.png"
-        }
-
-        captured_workflow = None
 
-        def capture_workflow(workflow, client_id):
-            nonlocal captured_workflow
-            captured_workflow = workflow
-            return "prompt-id"
-
-        mock_comfyui_client.submit_prompt.side_effect = capture_workflow
+        只关心提交给 ComfyUI 的 workflow，直接调用路由函数，不经过 HTTP 层
+        """
+        request = Img2ImgRequest(
+            prompt="test prompt",
+            negative_prompt="test negative",
+            input_image="test_image.png"
+        )
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        result = await cpu_quickly(request)
 
-            assert response.status_code == 200
-            # 验证 workflow 被正确修改
-            assert captured_workflow is not None
+        assert result.code == 200
+        # 从 mock 的调用记录中取出提交的 workflow，验证被正确修改
+        captured_workflow = mock_comfyui_client.submit_prompt.call_args.args[0]
+        assert captured_workflow["3"]["inputs"]["text"] == "test prompt"
+        assert captured_workflow["4"]["inputs"]["text"] == "test negative"
+        assert captured_workflow["2"]["inputs"]["image"] == "test_image.png"
 
-    def test_concurrent_scenario_requests(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_concurrent_scenario_requests(self, async_client, mock_comfyui_client):
         """
         测试并发场景请求
-        """
-        import threading
-
-        results = []
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
 
-        def make_request():
-            request_data = {
-                "prompt": "test",
-                "negative_prompt": "",
-                "input_image": "test.png"
-            }
-            with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-                resp = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-                results.append(resp.status_code)
+        在同一事件循环中用 asyncio.gather 并发发起请求
+        """
+        request_data = dict(_BASIC_REQ)
 
-        threads = [threading.Thread(target=make_request) for _ in range(3)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        responses = await asyncio.gather(*[
+            async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data) for _ in range(3)
+        ])
 
-        assert all(status == 200 for status in results)
+        results = [response.status_code for response in responses]
+        assert set(results) == {200}
 
 
 class TestScenariosExceptions:
     """场景接口异常测试"""
 
-    def test_cpu_quickly_connection_error(self, client, mock_comfyui_client):
-        """
-        测试 CPU Quickly 执行时连接错误
-
-        模拟 ComfyUIConnectionError 异常
-        """
-        from app.exceptions import ComfyUIConnectionError
-        from app.schemas import ResponseCode
-
-        mock_comfyui_client.submit_prompt.side_effect = ComfyUIConnectionError("无法连接到 ComfyUI")
-
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
-            assert "无法连接" in result["message"]
-
-    def test_cpu_quickly_workflow_validation_error(self, client, mock_comfyui_client):
-        """
-        测试 CPU Quickly 工作流验证错误
-
-        模拟 WorkflowValidationError 异常
-        """
-        from app.exceptions import WorkflowValidationError
-        from app.schemas import ResponseCode
-
-        mock_comfyui_client.submit_prompt.side_effect = WorkflowValidationError("工作流节点配置错误")
-
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == ResponseCode.ERROR_WORKFLOW_VALIDATION
-
-    def test_cpu_quickly_queue_error(self, client, mock_comfyui_client):
+    @pytest.mark.parametrize("exc,expected_code,expected_substr", [
+        (ComfyUIConnectionError("无法连接到 ComfyUI"), ERR_CONN, "无法连接"),
+        (WorkflowValidationError("工作流节点配置错误"), ERR_WORKFLOW, None),
+        (QueueOperationError("队列已满"), ERR_QUEUE, None),
+        (FileOperationError("无法读取图片文件"), ERR_FILE, None),
+        (ImageNotFoundError("missing.png"), ERR_IMAGE_NOT_FOUND, "missing.png"),
+    ], ids=["connection_error", "workflow_validation_error", "queue_error", "file_operation_error", "image_not_found_error"])
+    @pytest.mark.asyncio
+    async def test_cpu_quickly_exception_mapping(
+        self, async_client, mock_comfyui_client, exc, expected_code, expected_substr
+    ):
         """
-        测试 CPU Quickly 队列操作错误
+        参数化测试：CPU Quickly 提交时抛出业务异常
 
-        模拟 QueueOperationError 异常
-        """
-        from app.exceptions import QueueOperationError
-        from app.schemas import ResponseCode
-
-        mock_comfyui_client.submit_prompt.side_effect = QueueOperationError("队列已满")
-
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == ResponseCode.ERROR_QUEUE_OPERATION
-
-    def test_cpu_quickly_file_operation_error(self, client, mock_comfyui_client):
-        """
-        测试 CPU Quickly 文件操作错误
-
-        模拟 FileOperationError 异常
-        """
-        from app.exceptions import FileOperationError
-        from app.schemas import ResponseCode
-
-        mock_comfyui_client.submit_prompt.side_effect = FileOperationError("无法读取图片文件")
-
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png"
-        }
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
-
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == ResponseCode.ERROR_FILE_OPERATION
-
-    def test_cpu_quickly_image_not_found_error(self, client, mock_comfyui_client):
-        """
-        测试 CPU Quickly 图片未找到错误
-
-        模拟 ImageNotFoundError 异常
+        验证点:
+        - ComfyUIException 子类被全局异常处理器捕获，返回 500
+        - 响应 code 为对应的业务错误码
+        - 错误消息包含关键信息
         """
-        from app.exceptions import ImageNotFoundError
-        from app.schemas import ResponseCode
+        mock_comfyui_client.submit_prompt.side_effect = exc
 
-        mock_comfyui_client.submit_prompt.side_effect = ImageNotFoundError("missing.png")
-
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "missing.png"
-        }
+        request_data = dict(_BASIC_REQ)
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
 
-            assert response.status_code == 200
-            result = response.json()
-            assert result["code"] == ResponseCode.ERROR_IMAGE_NOT_FOUND
-            assert "missing.png" in result["message"]
+        assert response.status_code == 500
+        result = response.json()
+        assert result["code"] == expected_code
+        if expected_substr:
+            assert expected_substr in result["message"]
 
 
 class TestScenariosValidation:
     """场景接口参数验证测试"""
 
-    def test_invalid_request_body_type(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_invalid_request_body_type(self, async_client, mock_comfyui_client):
         """
         测试无效的请求体类型
         """
         # 发送数组而不是对象
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=[])
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=[])
 
-            assert response.status_code == 422
+        assert response.status_code == 422
 
-    def test_extra_fields_allowed(self, client, mock_comfyui_client):
+    @pytest.mark.asyncio
+    async def test_extra_fields_allowed(self, async_client, mock_comfyui_client):
         """
         测试额外字段的处理（Pydantic 默认忽略额外字段）
         """
-        request_data = {
-            "prompt": "test",
-            "negative_prompt": "",
-            "input_image": "test.png",
-            "extra_field": "should be ignored"
-        }
-
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
+        request_data = dict(_BASIC_REQ, extra_field="should be ignored")
 
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
 
-            # Pydantic 使用 extra='ignore' 模式，应该成功
-            assert response.status_code == 200
+        # Pydantic 使用 extra='ignore' 模式，应该成功
+        assert response.status_code == 200
 
-    @pytest.mark.parametrize("prompt,negative_prompt,image", [
-        ("x" * 5000, "y" * 5000, "a" * 200 + ".png"),  # 超长字符串
-        ("   ", "   ", "   "),  # 空白字符
-        ("test\nprompt", "test\nnegative", "test\nimage.png"),  # 包含换行
+    @pytest.mark.parametrize("body", [
+        pytest.param(_cpu_quickly_body(_LONG_A, _LONG_B, _LONG_IMG), id="long"),  # 超长字符串
+        pytest.param(_cpu_quickly_body("   ", "   ", "   "), id="whitespace"),  # 空白字符
+        pytest.param(_cpu_quickly_body("test\nprompt", "test\nnegative", "test\nimage.png"), id="newline"),  # 包含换行
     ])
-    def test_edge_case_strings(self, client, mock_comfyui_client, prompt, negative_prompt, image):
+    @pytest.mark.asyncio
+    async def test_edge_case_strings(self, async_client, mock_comfyui_client, body):
         """
         参数化测试：边界情况字符串
         """
-        request_data = {
-            "prompt": prompt,
-            "negative_prompt": negative_prompt,
-            "input_image": image
-        }
-
-        mock_comfyui_client.submit_prompt.return_value = "prompt-id"
-
-        with patch("app.routers.scenarios.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/scenarios/cpu_quickly", json=request_data)
+        response = await async_client.post("/api/v1/scenarios/cpu_quickly", content=body, headers=_JSON_HEADERS)
 
-            # 应该能接受各种字符串
-            assert response.status_code == 200
+        # 应该能接受各种字符串
+        assert response.status_code == 200
@@ -4,76 +4,82 @@
 测试 ApiResponse 和 ResponseCode 的正确性
 """
 
+import json
+from typing import Dict, List
+
 import pytest
 from pydantic import ValidationError
 
 from app.schemas import ApiResponse, ResponseCode
 
 
-class TestResponseCode:
-    """测试 ResponseCode 响应码常量"""
+# 响应码约定值
+_EXPECTED_CODES = {
+    # 成功类响应码
+    "SUCCESS": 200,
+    "CREATED": 201,
+    # 客户端错误响应码
+    "BAD_REQUEST": 400,
+    "UNAUTHORIZED": 401,
+    "FORBIDDEN": 403,
+    "NOT_FOUND": 404,
+    "CONFLICT": 409,
+    "VALIDATION_ERROR": 400,
+    # 服务器错误响应码
+    "INTERNAL_ERROR": 500,
+    "SERVICE_UNAVAILABLE": 503,
+    # 业务错误响应码
+    "ERROR_COMFYUI_CONNECTION": 1001,
+    "ERROR_WORKFLOW_VALIDATION": 1002,
+    "ERROR_QUEUE_OPERATION": 1003,
+    "ERROR_FILE_OPERATION": 1004,
+    "ERROR_IMAGE_NOT_FOUND": 404,
+    "ERROR_WEBSOCKET": 1006,
+    "ERROR_TEMPLATE_NOT_FOUND": 1007,
+}
+
+# 测试数据在模块加载时只构造一次，测试中只读
+_LARGE_LIST = tuple(range(10000))
+
+_DEEP_DATA = {
+    "level1": {
+        "level2": {
+            "level3": {
+                "level4": {
+                    "value": "deep"
+                }
+            }
+        }
+    }
+}
 
-    def test_success_codes(self):
-        """
-        测试成功类响应码
+_UNICODE_DATA = {
+    "emoji": "😀🎨",
+    "chinese": "中文测试",
+    "japanese": "日本語",
+    "arabic": "العربية"
+}
 
-        验证点:
-        - SUCCESS = 200
-        - CREATED = 201
-        """
-        assert ResponseCode.SUCCESS == 200
-        assert ResponseCode.CREATED == 201
+# ApiResponse.success(data={"test": "value"}) 的预期 JSON 输出（字段顺序固定为 code, message, data）
+_EXPECTED_JSON = json.dumps(
+    {"code": 200, "message": "success", "data": {"test": "value"}},
+    separators=(",", ":")
+)
 
-    def test_client_error_codes(self):
-        """
-        测试客户端错误响应码
 
-        验证点:
-        - BAD_REQUEST = 400
-        - UNAUTHORIZED = 401
-        - FORBIDDEN = 403
-        - NOT_FOUND = 404
-        - CONFLICT = 409
-        - VALIDATION_ERROR = 400
-        """
-        assert ResponseCode.BAD_REQUEST == 400
-        assert ResponseCode.UNAUTHORIZED == 401
-        assert ResponseCode.FORBIDDEN == 403
-        assert ResponseCode.NOT_FOUND == 404
-        assert ResponseCode.CONFLICT == 409
-        assert ResponseCode.VALIDATION_ERROR == 400
+class TestResponseCode:
+    """测试 ResponseCode 响应码常量"""
 
-    def test_server_error_codes(self):
+    @pytest.mark.parametrize("name,expected", list(_EXPECTED_CODES.items()))
+    def test_response_code_constants(self, name, expected):
         """
-        测试服务器错误响应码
+        参数化测试：响应码常量取值
 
         验证点:
-        - INTERNAL_ERROR = 500
-        - SERVICE_UNAVAILABLE = 503
+        - 各响应码常量的值与约定一致
         """
-        assert ResponseCode.INTERNAL_ERROR == 500
-        assert ResponseCode.SERVICE_UNAVAILABLE == 503
-
-    def test_business_error_codes(self):
-        """
-        测试业务错误响应码
-
-        验证点:
-        - ERROR_COMFYUI_CONNECTION = 1001
-        - ERROR_WORKFLOW_VALIDATION = 1002
-        - ERROR_QUEUE_OPERATION = 1003
-        - ERROR_FILE_OPERATION = 1004
-        - ERROR_IMAGE_NOT_FOUND = 404
-        - ERROR_WEBSOCKET = 1006
-        - ERROR_TEMPLATE_NOT_FOUND = 1007
-        """
-        assert ResponseCode.ERROR_COMFYUI_CONNECTION == 1001
-        assert ResponseCode.ERROR_WORKFLOW_VALIDATION == 1002
-        assert ResponseCode.ERROR_QUEUE_OPERATION == 1003
-        assert ResponseCode.ERROR_FILE_OPERATION == 1004
-        assert ResponseCode.ERROR_IMAGE_NOT_FOUND == 404
-        assert ResponseCode.ERROR_WEBSOCKET == 1006
-        assert ResponseCode.ERROR_TEMPLATE_NOT_FOUND == 1007
+        # 在测试体内取值：常量缺失或改名时只有对应用例失败，不影响整个模块的收集
+        assert getattr(ResponseCode, name, None) == expected
 
 
 class TestApiResponse:
@@ -197,10 +203,7 @@ class TestApiResponse:
         - model_dump() 返回正确的字典结构
         - 包含 code, message, data 字段
         """
-        response = ApiResponse.success(
-            data={"id": 123},
-            message="操作成功"
-        )
+        response = ApiResponse.success(data={"id": 123}, message="操作成功")
         serialized = response.model_dump()
 
         assert serialized == {
@@ -214,10 +217,11 @@ class TestApiResponse:
         测试 data 为 None 时的序列化
 
         验证点:
-        - data 字段正确序列化为 None
+        - data 字段序列化为 JSON null，解析后为 None
         """
         response = ApiResponse.error(code=404, message="未找到", data=None)
-        serialized = response.model_dump()
+        # model_dump_json 由 pydantic-core 直接输出 JSON，不经过中间字典
+        serialized = json.loads(response.model_dump_json())
 
         assert serialized == {
             "code": 404,
@@ -230,17 +234,11 @@ class TestApiResponse:
         测试 JSON 兼容性
 
         验证点:
-        - model_dump_json() 返回有效 JSON 字符串
-        - 可被 json.loads() 解析
+        - model_dump_json() 按字段声明顺序输出紧凑 JSON，与预期字符串逐字节一致
         """
-        import json
-
         response = ApiResponse.success(data={"test": "value"})
-        json_str = response.model_dump_json()
 
-        parsed = json.loads(json_str)
-        assert parsed["code"] == 200
-        assert parsed["data"]["test"] == "value"
+        assert response.model_dump_json() == _EXPECTED_JSON
 
     def test_generic_type_support(self):
         """
@@ -251,59 +249,47 @@ class TestApiResponse:
         - 支持 ApiResponse[List]
         - 类型提示正确
         """
-        from typing import Dict, List
-
         # Dict 类型
         dict_response: ApiResponse[Dict[str, int]] = ApiResponse.success(data={"a": 1, "b": 2})
-        assert isinstance(dict_response.data, dict)
+        assert dict_response.data == {"a": 1, "b": 2}
 
         # List 类型
         list_response: ApiResponse[List[str]] = ApiResponse.success(data=["a", "b", "c"])
-        assert isinstance(list_response.data, list)
+        assert list_response.data == ["a", "b", "c"]
 
-    def test_special_characters_in_message(self):
+    @pytest.mark.parametrize("message", [
+        "操作成功完成",
+        "错误: 文件未找到!",
+        "第一行\n第二行",
+    ], ids=["chinese", "symbols", "newline"])
+    def test_special_characters_in_message(self, message):
         """
-        测试消息中的特殊字符
+        参数化测试：消息中的特殊字符
 
         验证点:
         - 支持中文
         - 支持特殊符号
         - 支持换行符
         """
-        # 中文
-        response = ApiResponse.success(message="操作成功完成")
-        assert response.message == "操作成功完成"
-
-        # 特殊符号
-        response = ApiResponse.error(code=500, message="错误: 文件未找到!")
-        assert "错误:" in response.message
+        assert ApiResponse.success(message=message).message == message
 
-        # 换行符
-        message = "第一行\n第二行"
-        response = ApiResponse.error(code=500, message=message)
-        assert response.message == message
-
-    def test_empty_and_whitespace_values(self):
+    @pytest.mark.parametrize("data,message", [
+        ("", ""),
+        ([], "success"),
+        ({}, "success"),
+    ], ids=["empty_string", "empty_list", "empty_dict"])
+    def test_empty_and_whitespace_values(self, data, message):
         """
-        测试空值和空白字符
+        参数化测试：空值和空白字符
 
         验证点:
         - 支持空字符串
         - 支持空列表
         - 支持空字典
         """
-        # 空字符串
-        response = ApiResponse.success(data="", message="")
-        assert response.data == ""
-        assert response.message == ""
-
-        # 空列表
-        response = ApiResponse.success(data=[])
-        assert response.data == []
-
-        # 空字典
-        response = ApiResponse.success(data={})
-        assert response.data == {}
+        response = ApiResponse.success(data=data, message=message)
+        assert response.data == data
+        assert response.message == message
 
     def test_data_field_optional(self):
         """
@@ -332,48 +318,28 @@ class TestApiResponseEdgeCases:
         验证点:
         - 支持大量数据的序列化
         """
-        large_list = list(range(10000))
-        response = ApiResponse.success(data=large_list)
-        assert len(response.data) == 10000
+        serialized = json.loads(ApiResponse.success(data=_LARGE_LIST).model_dump_json())
+        assert serialized["data"] == list(_LARGE_LIST)
 
     def test_nested_deep_structure(self):
         """
         测试深层嵌套结构
 
         验证点:
-        - 支持多层嵌套
-        """
-        deep_data = {
-            "level1": {
-                "level2": {
-                    "level3": {
-                        "level4": {
-                            "value": "deep"
-                        }
-                    }
-                }
-            }
-        }
-        response = ApiResponse.success(data=deep_data)
-        assert response.data["level1"]["level2"]["level3"]["level4"]["value"] == "deep"
+        - 多层嵌套结构序列化为 JSON 后层级完整
+        """
+        serialized = json.loads(ApiResponse.success(data=_DEEP_DATA).model_dump_json())
+        assert serialized["data"]["level1"]["level2"]["level3"]["level4"]["value"] == "deep"
 
     def test_unicode_in_data(self):
         """
         测试数据中的 Unicode 字符
 
         验证点:
-        - 支持 emoji
-        - 支持各种语言字符
-        """
-        data = {
-            "emoji": "😀🎨",
-            "chinese": "中文测试",
-            "japanese": "日本語",
-            "arabic": "العربية"
-        }
-        response = ApiResponse.success(data=data)
-        assert response.data["emoji"] == "😀🎨"
-        assert response.data["chinese"] == "中文测试"
+        - emoji 和各种语言字符序列化为 JSON 后保持不变
+        """
+        serialized = json.loads(ApiResponse.success(data=_UNICODE_DATA).model_dump_json())
+        assert serialized["data"] == _UNICODE_DATA
 
     def test_boolean_and_numeric_codes(self):
         """
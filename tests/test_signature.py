@@ -2,28 +2,85 @@
 签名验签模块单元测试
 
 测试基于 HMAC-SHA256 的签名验证流程（简化版）
+
+约定：恒定时间比较（hmac.compare_digest）只在 SignatureManager.verify_signature 中使用，
+测试断言中直接用 == 比较签名
 """
 
-import time
+from functools import lru_cache
+from types import SimpleNamespace
+
 import pytest
 
+from app.internal import signature as signature_module
 from app.internal.signature import (
     SignatureManager,
     SignatureException
 )
 
 
+# 测试用的密钥
+SECRET = "test_secret_key_12345678"
+
+
+# 通用测试路径
+TEST_PATH = "/api/v1/test"
+
+
+# 预生成签名使用的固定时间戳（verify_signature 不校验时间戳时效）
+FIXED_TS = 1704614400
+
+# 已知答案：SECRET + FIXED_TS 下的签名（签名字符串为 METHOD\nPATH\nTIMESTAMP\nSECRET）
+KNOWN_SIGNATURES = {
+    ("POST", "/api/v1/workflows/submit"): "93d5e022f8c63893334630ed64906db03ab560812d784687ac3c5ab3dcb69865",
+    ("GET", "/api/v1/queue/status"): "a42db13059ca31a4edce1965bdd079242e628ab67b0fdacf99577fd221e62557",
+}
+
+
+@pytest.fixture(scope="module")
+def secret():
+    """测试用的密钥（模块内只解析一次）"""
+    return SECRET
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """
+    冻结签名模块的时钟，返回固定的"当前"时间戳（秒）
+
+    只替换 app.internal.signature 模块中的 time 引用，不影响全局 time.time
+    """
+    monkeypatch.setattr(signature_module, "time", SimpleNamespace(time=lambda: float(FIXED_TS)))
+    return FIXED_TS
+
+
+@lru_cache(maxsize=None)
+def _sign(method, path, secret=SECRET):
+    """按 (method, path, secret) 缓存固定时间戳下生成的签名"""
+    return SignatureManager.generate_signature(
+        method=method,
+        path=path,
+        timestamp=FIXED_TS,
+        secret=secret
+    )
+
+
+@pytest.fixture(scope="session")
+def signed_request_factory():
+    """
+    提供带缓存的签名生成函数
+
+    验签类测试只把签名当作输入数据，相同参数的签名整个测试会话只计算一次
+    """
+    return _sign
+
+
 class TestSignatureManager:
     """签名管理器测试类"""
 
-    @pytest.fixture
-    def secret(self):
-        """测试用的密钥"""
-        return "test_secret_key_12345678"
-
     # ========== 签名生成测试 ==========
 
-    def test_generate_signature_success(self, secret):
+    def test_generate_signature_success(self, secret, now):
         """测试成功生成签名"""
         result = SignatureManager.generate_signature(
             method="POST",
@@ -37,22 +94,22 @@ class TestSignatureManager:
 
         # 签名应该是 64 位十六进制字符串（SHA256）
         assert len(result["signature"]) == 64
-        assert all(c in "0123456789abcdef" for c in result["signature"])
+        try:
+            bytes.fromhex(result["signature"])
+        except ValueError:
+            pytest.fail(f"签名不是十六进制字符串: {result['signature']}")
 
-        # Timestamp 应该是当前时间附近的整数
-        ts = int(result["timestamp"])
-        current_ts = int(time.time())
-        assert abs(current_ts - ts) < 10
+        # 未传 timestamp 时使用当前时间
+        assert int(result["timestamp"]) == now
 
     def test_generate_signature_without_secret(self):
         """测试没有密钥时生成签名失败"""
-        with pytest.raises(SignatureException) as exc_info:
+        with pytest.raises(SignatureException, match="密钥不能为空"):
             SignatureManager.generate_signature(
                 method="POST",
-                path="/api/v1/test",
+                path=TEST_PATH,
                 secret=""
             )
-        assert "密钥不能为空" in str(exc_info.value)
 
     def test_generate_signature_custom_timestamp(self, secret):
         """测试使用自定义时间戳"""
@@ -60,40 +117,60 @@ class TestSignatureManager:
 
         result = SignatureManager.generate_signature(
             method="GET",
-            path="/api/v1/test",
+            path=TEST_PATH,
             timestamp=custom_ts,
             secret=secret
         )
 
         assert int(result["timestamp"]) == custom_ts
 
-    def test_generate_signature_method_case_insensitive(self, secret):
-        """测试 HTTP 方法大小写不敏感"""
+    def test_generate_signature_method_case_insensitive(self, secret, now):
+        """
+        测试 HTTP 方法大小写不敏感
+
+        使用 now fixture 冻结时钟，两次生成使用同一时间戳，不会因跨秒而得到不同签名
+        """
         result1 = SignatureManager.generate_signature(
             method="post",
-            path="/api/v1/test",
+            path=TEST_PATH,
             secret=secret
         )
 
         result2 = SignatureManager.generate_signature(
             method="POST",
-            path="/api/v1/test",
+            path=TEST_PATH,
             secret=secret
         )
 
         # 签名应该相同（方法都转大写）
         assert result1["signature"] == result2["signature"]
 
+    @pytest.mark.parametrize("method,path,expected", [
+        ("POST", "/api/v1/workflows/submit", KNOWN_SIGNATURES[("POST", "/api/v1/workflows/submit")]),
+        ("GET", "/api/v1/queue/status", KNOWN_SIGNATURES[("GET", "/api/v1/queue/status")]),
+        ("get", "/api/v1/queue/status", KNOWN_SIGNATURES[("GET", "/api/v1/queue/status")]),
+    ], ids=["post_submit", "get_status", "get_status_lowercase"])
+    def test_generate_signature_known_answer(self, secret, method, path, expected):
+        """
+        参数化测试：固定输入下的签名与预先计算的已知答案一致
+
+        验证点:
+        - 签名字符串格式（方法大写、字段顺序、换行分隔）没有被改动
+        """
+        result = SignatureManager.generate_signature(
+            method=method,
+            path=path,
+            timestamp=FIXED_TS,
+            secret=secret
+        )
+
+        assert result == {"signature": expected, "timestamp": str(FIXED_TS)}
+
     # ========== 签名验证测试 ==========
 
-    def test_verify_signature_success(self, secret):
+    def test_verify_signature_success(self, secret, signed_request_factory):
         """测试成功验证签名"""
-        # 生成签名
-        sig_result = SignatureManager.generate_signature(
-            method="POST",
-            path="/api/v1/workflows/submit",
-            secret=secret
-        )
+        sig_result = signed_request_factory("POST", "/api/v1/workflows/submit")
 
         # 验证签名应该成功
         result = SignatureManager.verify_signature(
@@ -106,144 +183,91 @@ class TestSignatureManager:
 
         assert result is True
 
-    def test_verify_signature_wrong_method(self, secret):
-        """测试错误的 HTTP 方法导致签名验证失败"""
-        # 用 POST 生成签名
-        sig_result = SignatureManager.generate_signature(
-            method="POST",
-            path="/api/v1/test",
-            secret=secret
-        )
-
-        # 用 GET 验证应该失败
-        with pytest.raises(SignatureException) as exc_info:
-            SignatureManager.verify_signature(
-                method="GET",
-                path="/api/v1/test",
-                signature=sig_result["signature"],
-                timestamp=sig_result["timestamp"],
-                secret=secret
-            )
-        assert "签名验证失败" in str(exc_info.value)
-
-    def test_verify_signature_wrong_path(self, secret):
-        """测试错误的路径导致签名验证失败"""
-        sig_result = SignatureManager.generate_signature(
-            method="GET",
-            path="/api/v1/test",
-            secret=secret
-        )
-
-        with pytest.raises(SignatureException) as exc_info:
-            SignatureManager.verify_signature(
-                method="GET",
-                path="/api/v1/wrong",
-                signature=sig_result["signature"],
-                timestamp=sig_result["timestamp"],
-                secret=secret
-            )
-        assert "签名验证失败" in str(exc_info.value)
-
-    def test_verify_signature_wrong_secret(self):
-        """测试错误的密钥导致签名验证失败"""
-        secret1 = "secret_111"
-        secret2 = "secret_222"
-
-        sig_result = SignatureManager.generate_signature(
-            method="POST",
-            path="/api/v1/test",
-            secret=secret1
-        )
-
-        with pytest.raises(SignatureException) as exc_info:
-            SignatureManager.verify_signature(
-                method="POST",
-                path="/api/v1/test",
-                signature=sig_result["signature"],
-                timestamp=sig_result["timestamp"],
-                secret=secret2
-            )
-        assert "签名验证失败" in str(exc_info.value)
-
-    def test_verify_signature_missing_params(self, secret):
-        """测试缺少必需参数"""
-        # 缺少签名
-        with pytest.raises(SignatureException) as exc_info:
-            SignatureManager.verify_signature(
-                method="POST",
-                path="/api/v1/test",
-                signature="",
-                timestamp="123",
-                secret=secret
-            )
-        assert "签名字符串不能为空" in str(exc_info.value)
-
-        # 缺少时间戳
-        with pytest.raises(SignatureException) as exc_info:
-            SignatureManager.verify_signature(
-                method="POST",
-                path="/api/v1/test",
-                signature="abc",
-                timestamp="",
-                secret=secret
-            )
-        assert "时间戳不能为空" in str(exc_info.value)
-
-        # 缺少密钥
-        with pytest.raises(SignatureException) as exc_info:
-            SignatureManager.verify_signature(
-                method="POST",
-                path="/api/v1/test",
-                signature="abc",
-                timestamp="123",
-                secret=""
-            )
-        assert "密钥不能为空" in str(exc_info.value)
+    @pytest.mark.parametrize("override,expected_msg", [
+        ({"method": "GET"}, "签名验证失败"),
+        ({"path": "/api/v1/wrong"}, "签名验证失败"),
+        ({"secret": "other_secret"}, "签名验证失败"),
+        ({"signature": ""}, "签名字符串不能为空"),
+        ({"timestamp": ""}, "时间戳不能为空"),
+        ({"secret": ""}, "密钥不能为空"),
+    ], ids=["wrong_method", "wrong_path", "wrong_secret", "empty_signature", "empty_timestamp", "empty_secret"])
+    def test_verify_signature_failures(self, secret, signed_request_factory, override, expected_msg):
+        """
+        参数化测试：验签失败场景
+
+        以 POST /api/v1/test 的签名为基准，逐项替换某个参数后验签应该失败
+        """
+        sig_result = signed_request_factory("POST", TEST_PATH)
+        kwargs = {
+            "method": "POST",
+            "path": TEST_PATH,
+            "signature": sig_result["signature"],
+            "timestamp": sig_result["timestamp"],
+            "secret": secret,
+            **override
+        }
+
+        with pytest.raises(SignatureException, match=expected_msg):
+            SignatureManager.verify_signature(**kwargs)
 
     # ========== 时间戳验证测试 ==========
 
-    def test_timestamp_valid_within_tolerance(self):
-        """测试时间戳在容忍范围内有效"""
-        current_time = int(time.time())
-        tolerance = 300
-
-        assert SignatureManager.is_timestamp_valid(current_time, tolerance) is True
-        assert SignatureManager.is_timestamp_valid(current_time - tolerance, tolerance) is True
-        assert SignatureManager.is_timestamp_valid(current_time + tolerance, tolerance) is True
+    @pytest.mark.parametrize("offset", [0, -300, 300], ids=["now", "lower_bound", "upper_bound"])
+    def test_timestamp_valid_within_tolerance(self, now, offset):
+        """参数化测试：时间戳在容忍范围内（含边界）有效"""
+        assert SignatureManager.is_timestamp_valid(now + offset, 300) is True
 
-    def test_timestamp_invalid_outside_tolerance(self):
-        """测试时间戳超出容忍范围无效"""
-        current_time = int(time.time())
-        tolerance = 300
-
-        assert SignatureManager.is_timestamp_valid(current_time - tolerance - 1, tolerance) is False
-        assert SignatureManager.is_timestamp_valid(current_time + tolerance + 1, tolerance) is False
+    @pytest.mark.parametrize("offset", [-301, 301], ids=["too_old", "too_new"])
+    def test_timestamp_invalid_outside_tolerance(self, now, offset):
+        """参数化测试：时间戳超出容忍范围无效"""
+        assert SignatureManager.is_timestamp_valid(now + offset, 300) is False
 
     # ========== 不同 HTTP 方法测试 ==========
 
-    def test_signature_different_methods(self, secret):
+    @pytest.mark.parametrize("method", ["GET", "POST", "PUT", "DELETE", "PATCH"])
+    def test_signature_different_methods(self, secret, signed_request_factory, method):
         """测试不同 HTTP 方法的签名"""
-        for method in ["GET", "POST", "PUT", "DELETE", "PATCH"]:
-            sig_result = SignatureManager.generate_signature(
-                method=method,
-                path="/api/v1/test",
-                secret=secret
-            )
+        sig_result = signed_request_factory(method, TEST_PATH)
 
-            result = SignatureManager.verify_signature(
-                method=method,
-                path="/api/v1/test",
-                signature=sig_result["signature"],
-                timestamp=sig_result["timestamp"],
-                secret=secret
-            )
+        result = SignatureManager.verify_signature(
+            method=method,
+            path=TEST_PATH,
+            signature=sig_result["signature"],
+            timestamp=sig_result["timestamp"],
+            secret=secret
+        )
+
+        assert result is True
+
+    def test_signature_distinct_for_distinct_inputs(self):
+        """
+        测试任一输入不同时签名互不相同
+
+        一次集合比较覆盖所有组合，可发现截断、字段遗漏等导致的签名碰撞
+        """
+        inputs = [
+            ("POST", TEST_PATH, FIXED_TS, SECRET),
+            ("GET", TEST_PATH, FIXED_TS, SECRET),
+            ("POST", "/api/v1/test/", FIXED_TS, SECRET),
+            ("POST", "/api/v1/tes", FIXED_TS, SECRET),
+            ("POST", TEST_PATH, FIXED_TS + 1, SECRET),
+            ("POST", TEST_PATH, FIXED_TS, SECRET + "x"),
+            ("POST", TEST_PATH, 0, SECRET),
+        ]
+
+        signatures = {
+            SignatureManager.generate_signature(
+                method=method, path=path, timestamp=ts, secret=key
+            )["signature"]
+            for method, path, ts, key in inputs
+        }
 
-            assert result is True
+        assert len(signatures) == len(inputs)
 
     # ========== 端到端场景测试 ==========
 
     def test_end_to_end_flow(self, secret):
-        """测试完整的签名验证流程"""
+        """测试完整的签名验证流程（实时生成签名）"""
         # 生成签名
         sig_result = SignatureManager.generate_signature(
             method="POST",
@@ -260,13 +284,9 @@ class TestSignatureManager:
             secret=secret
         ) is True
 
-    def test_get_request(self, secret):
+    def test_get_request(self, secret, signed_request_factory):
         """测试 GET 请求"""
-        sig_result = SignatureManager.generate_signature(
-            method="GET",
-            path="/api/v1/queue/status",
-            secret=secret
-        )
+        sig_result = signed_request_factory("GET", "/api/v1/queue/status")
 
         assert SignatureManager.verify_signature(
             method="GET",
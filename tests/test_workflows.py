@@ -4,62 +4,60 @@
 测试 /api/v1/workflows/* 相关接口
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from unittest.mock import AsyncMock, patch
 
 
-class TestWorkflowsSubmit:
-    """测试提交工作流接口 POST /api/v1/workflows/submit"""
+# 包含多个节点的完整工作流
+_COMPLEX_WORKFLOW = {
+    "1": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}},
+    "2": {"class_type": "CLIPTextEncode", "inputs": {"text": "positive prompt"}},
+    "3": {"class_type": "CLIPTextEncode", "inputs": {"text": "negative prompt"}},
+    "4": {"class_type": "KSampler", "inputs": {"seed": 12345, "steps": 20}},
+    "5": {"class_type": "VAEDecode", "inputs": {"samples": ["4", 0], "vae": ["1", 0]}},
+    "6": {"class_type": "SaveImage", "inputs": {"images": ["5", 0]}},
+}
 
-    def test_submit_workflow_success(self, client, mock_comfyui_client, valid_workflow_submit_request):
-        """
-        测试成功提交工作流
 
-        验证点:
-        - 状态码为 200
-        - 返回 prompt_id
-        - 返回正确的响应格式
-        """
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json=valid_workflow_submit_request)
+@pytest.fixture(autouse=True)
+def patch_comfyui_client(monkeypatch, mock_comfyui_client):
+    """
+    将工作流路由使用的 comfyui_client 替换为 mock
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == 200
-            assert data["message"] == "工作流已提交"
-            assert "data" in data
-            assert "prompt_id" in data["data"]
-            mock_comfyui_client.submit_prompt.assert_called_once()
+    每个测试只做一次属性替换，测试体内无需再使用 patch 上下文
+    """
+    monkeypatch.setattr("app.routers.workflows.comfyui_client", mock_comfyui_client)
+    return mock_comfyui_client
 
-    def test_submit_workflow_with_client_id(self, client, mock_comfyui_client):
-        """
-        测试提交工作流并指定 client_id
-        """
-        request_data = {
-            "workflow": {"1": {"class_type": "KSampler"}},
-            "client_id": "test-client-123"
-        }
-
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json=request_data)
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["data"]["client_id"] == "test-client-123"
+class TestWorkflowsSubmit:
+    """测试提交工作流接口 POST /api/v1/workflows/submit"""
 
-    def test_submit_workflow_empty_workflow(self, client, mock_comfyui_client):
+    @pytest.mark.parametrize("request_data", [
+        {"workflow": {"1": {"class_type": "KSampler", "inputs": {"seed": 123456789}}}, "client_id": "test-client-1"},
+        {"workflow": {"1": {"class_type": "KSampler"}}, "client_id": "test-client-123"},
+        # 空 workflow 也应该能提交
+        {"workflow": {}, "client_id": "test"},
+        {"workflow": _COMPLEX_WORKFLOW, "client_id": "test"},
+    ], ids=["basic", "with_client_id", "empty_workflow", "complex_workflow"])
+    def test_submit_workflow_variants(self, client, mock_comfyui_client, request_data):
         """
-        测试提交空工作流
+        参数化测试：成功提交不同的工作流
 
-        验证系统能处理空 workflow 的情况
+        验证点:
+        - 状态码为 200
+        - 返回 prompt_id 和请求中的 client_id
+        - workflow 和 client_id 原样传给 ComfyUI 客户端
         """
-        request_data = {"workflow": {}, "client_id": "test"}
-
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json=request_data)
+        response = client.post("/api/v1/workflows/submit", json=request_data)
 
-            assert response.status_code == 200
-            mock_comfyui_client.submit_prompt.assert_called_once_with({}, "test")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["code"] == 200
+        assert data["message"] == "工作流已提交"
+        assert data["data"] == {"prompt_id": "test-prompt-id-123", "client_id": request_data["client_id"]}
+        mock_comfyui_client.submit_prompt.assert_called_once_with(request_data["workflow"], request_data["client_id"])
 
     def test_submit_workflow_connection_error(self, client, mock_comfyui_client):
         """
@@ -72,13 +70,12 @@ class TestWorkflowsSubmit:
 
         mock_comfyui_client.submit_prompt.side_effect = ComfyUIConnectionError("无法连接到 ComfyUI")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
+        response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
 
-            assert response.status_code == 200  # 业务异常仍然返回 200
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
-            assert "无法连接" in data["message"]
+        assert response.status_code == 200  # 业务异常仍然返回 200
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
+        assert "无法连接" in data["message"]
 
 
 class TestWorkflowsHistory:
@@ -91,15 +88,14 @@ class TestWorkflowsHistory:
         prompt_id = "test-prompt-id"
         mock_comfyui_client.get_history.return_value = mock_history_data
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.get(f"/api/v1/workflows/{prompt_id}/history")
+        response = client.get(f"/api/v1/workflows/{prompt_id}/history")
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == 200
-            assert data["message"] == "获取历史记录成功"
-            assert data["data"]["prompt_id"] == prompt_id
-            mock_comfyui_client.get_history.assert_called_once_with(prompt_id)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["code"] == 200
+        assert data["message"] == "获取历史记录成功"
+        assert data["data"]["prompt_id"] == prompt_id
+        mock_comfyui_client.get_history.assert_called_once_with(prompt_id)
 
     def test_get_history_not_found(self, client, mock_comfyui_client):
         """
@@ -109,13 +105,12 @@ class TestWorkflowsHistory:
         """
         mock_comfyui_client.get_history.return_value = None
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.get("/api/v1/workflows/non-existent/history")
+        response = client.get("/api/v1/workflows/non-existent/history")
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == 404
-            assert "不存在" in data["message"] or "尚未完成" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["code"] == 404
+        assert "不存在" in data["message"] or "尚未完成" in data["message"]
 
     def test_get_history_with_empty_history(self, client, mock_comfyui_client):
         """
@@ -123,33 +118,31 @@ class TestWorkflowsHistory:
         """
         mock_comfyui_client.get_history.return_value = {}
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.get("/api/v1/workflows/empty-id/history")
+        response = client.get("/api/v1/workflows/empty-id/history")
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == 404
+        assert response.status_code == 200
+        data = response.json()
+        assert data["code"] == 404
 
-    @pytest.mark.parametrize("prompt_id,expected_code", [
-        ("valid-id-123", 200),
-        ("another-id-456", 200),
-        ("not-found", 404),
-    ])
-    def test_get_history_parametrized(self, client, mock_comfyui_client, prompt_id, expected_code):
+    @pytest.mark.parametrize("prompt_id,history_return,expected_code", [
+        ("valid-id-123", {"prompt": [1, "test"]}, 200),
+        ("another-id-456", {"prompt": [1, "test"]}, 200),
+        ("not-found", None, 404),
+    ], ids=["found", "found_another", "not_found"])
+    def test_get_history_parametrized(self, client, mock_comfyui_client, prompt_id, history_return, expected_code):
         """
         参数化测试：多种场景获取历史
+
+        路由为 GET /api/v1/workflows/history?prompt_id=...，历史不存在时返回 HTTP 404
         """
-        if expected_code == 200:
-            mock_comfyui_client.get_history.return_value = {"prompt": [1, "test"]}
-        else:
-            mock_comfyui_client.get_history.return_value = None
+        mock_comfyui_client.get_history.return_value = history_return
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.get(f"/api/v1/workflows/{prompt_id}/history")
+        response = client.get("/api/v1/workflows/history", params={"prompt_id": prompt_id})
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == expected_code
+        assert response.status_code == expected_code
+        data = response.json()
+        assert data["code"] == expected_code
+        mock_comfyui_client.get_history.assert_called_once_with(prompt_id)
 
 
 class TestWorkflowsInterrupt:
@@ -162,15 +155,14 @@ class TestWorkflowsInterrupt:
         request_data = {"prompt_id": "test-prompt-123"}
         mock_comfyui_client.interrupt.return_value = {"detail": "Interrupted"}
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/interrupt", json=request_data)
+        response = client.post("/api/v1/workflows/interrupt", json=request_data)
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == 200
-            assert data["message"] == "工作流已中断"
-            assert "detail" in data["data"]
-            mock_comfyui_client.interrupt.assert_called_once_with("test-prompt-123")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["code"] == 200
+        assert data["message"] == "工作流已中断"
+        assert "detail" in data["data"]
+        mock_comfyui_client.interrupt.assert_called_once_with("test-prompt-123")
 
     def test_interrupt_workflow_without_prompt_id(self, client, mock_comfyui_client):
         """
@@ -178,12 +170,11 @@ class TestWorkflowsInterrupt:
         """
         request_data = {}
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/interrupt", json=request_data)
+        response = client.post("/api/v1/workflows/interrupt", json=request_data)
 
-            # 应该返回成功，但 prompt_id 为 None
-            assert response.status_code == 200
-            mock_comfyui_client.interrupt.assert_called_once_with(None)
+        # 应该返回成功，但 prompt_id 为 None
+        assert response.status_code == 200
+        mock_comfyui_client.interrupt.assert_called_once_with(None)
 
     def test_interrupt_workflow_exception(self, client, mock_comfyui_client):
         """
@@ -191,13 +182,12 @@ class TestWorkflowsInterrupt:
         """
         mock_comfyui_client.interrupt.side_effect = Exception("中断失败")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/interrupt", json={"prompt_id": "test"})
+        response = client.post("/api/v1/workflows/interrupt", json={"prompt_id": "test"})
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["code"] == 500
-            assert "中断工作流失败" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["code"] == 500
+        assert "中断工作流失败" in data["message"]
 
 
 class TestWorkflowsExceptions:
@@ -214,13 +204,12 @@ class TestWorkflowsExceptions:
 
         mock_comfyui_client.submit_prompt.side_effect = WorkflowValidationError("工作流格式不正确")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
+        response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_WORKFLOW_VALIDATION
-            assert "格式不正确" in data["message"]
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_WORKFLOW_VALIDATION
+        assert "格式不正确" in data["message"]
 
     def test_submit_workflow_queue_error(self, client, mock_comfyui_client):
         """
@@ -233,12 +222,11 @@ class TestWorkflowsExceptions:
 
         mock_comfyui_client.submit_prompt.side_effect = QueueOperationError("队列已满")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
+        response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_QUEUE_OPERATION
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_QUEUE_OPERATION
 
     def test_submit_workflow_file_operation_error(self, client, mock_comfyui_client):
         """
@@ -251,12 +239,11 @@ class TestWorkflowsExceptions:
 
         mock_comfyui_client.submit_prompt.side_effect = FileOperationError("无法保存工作流文件")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
+        response = client.post("/api/v1/workflows/submit", json={"workflow": {}})
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_FILE_OPERATION
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_FILE_OPERATION
 
     def test_get_history_connection_error(self, client, mock_comfyui_client):
         """
@@ -267,12 +254,11 @@ class TestWorkflowsExceptions:
 
         mock_comfyui_client.get_history.side_effect = ComfyUIConnectionError("无法连接")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.get("/api/v1/workflows/test-id/history")
+        response = client.get("/api/v1/workflows/test-id/history")
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
 
     def test_get_history_general_exception(self, client, mock_comfyui_client):
         """
@@ -280,12 +266,11 @@ class TestWorkflowsExceptions:
         """
         mock_comfyui_client.get_history.side_effect = Exception("获取历史失败")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.get("/api/v1/workflows/test-id/history")
+        response = client.get("/api/v1/workflows/test-id/history")
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == 500
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == 500
 
     def test_interrupt_connection_error(self, client, mock_comfyui_client):
         """
@@ -296,12 +281,11 @@ class TestWorkflowsExceptions:
 
         mock_comfyui_client.interrupt.side_effect = ComfyUIConnectionError("连接断开")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/interrupt", json={"prompt_id": "test"})
+        response = client.post("/api/v1/workflows/interrupt", json={"prompt_id": "test"})
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_COMFYUI_CONNECTION
 
     def test_interrupt_queue_error(self, client, mock_comfyui_client):
         """
@@ -312,12 +296,11 @@ class TestWorkflowsExceptions:
 
         mock_comfyui_client.interrupt.side_effect = QueueOperationError("中断队列操作失败")
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/interrupt", json={"prompt_id": "test"})
+        response = client.post("/api/v1/workflows/interrupt", json={"prompt_id": "test"})
 
-            assert response.status_code == 500
-            data = response.json()
-            assert data["code"] == ResponseCode.ERROR_QUEUE_OPERATION
+        assert response.status_code == 500
+        data = response.json()
+        assert data["code"] == ResponseCode.ERROR_QUEUE_OPERATION
 
 
 class TestWorkflowsEdgeCases:
@@ -330,52 +313,24 @@ class TestWorkflowsEdgeCases:
         # 提交非字典类型的 workflow
         request_data = {"workflow": "not-a-dict"}
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json=request_data)
-
-            # 验证系统处理了这种情况
-            assert response.status_code == 200
-
-    def test_submit_complex_workflow(self, client, mock_comfyui_client):
-        """
-        测试提交包含多个节点的复杂工作流
-        """
-        complex_workflow = {
-            "1": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}},
-            "2": {"class_type": "CLIPTextEncode", "inputs": {"text": "positive prompt"}},
-            "3": {"class_type": "CLIPTextEncode", "inputs": {"text": "negative prompt"}},
-            "4": {"class_type": "KSampler", "inputs": {"seed": 12345, "steps": 20}},
-            "5": {"class_type": "VAEDecode", "inputs": {"samples": ["4", 0], "vae": ["1", 0]}},
-            "6": {"class_type": "SaveImage", "inputs": {"images": ["5", 0]}},
-        }
-
-        request_data = {"workflow": complex_workflow, "client_id": "test"}
+        response = client.post("/api/v1/workflows/submit", json=request_data)
 
-        with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-            response = client.post("/api/v1/workflows/submit", json=request_data)
-
-            assert response.status_code == 200
-            mock_comfyui_client.submit_prompt.assert_called_once()
+        # 验证系统处理了这种情况
+        assert response.status_code == 200
 
     def test_concurrent_submit_requests(self, client, mock_comfyui_client):
         """
         测试并发提交多个工作流请求
-        """
-        import threading
 
-        results = []
+        mock 由 autouse fixture 在测试开始前替换一次，各线程共享同一个替换
+        """
         request_data = {"workflow": {}, "client_id": "test"}
 
-        def make_request():
-            with patch("app.routers.workflows.comfyui_client", mock_comfyui_client):
-                resp = client.post("/api/v1/workflows/submit", json=request_data)
-                results.append(resp.status_code)
+        def make_request(_):
+            return client.post("/api/v1/workflows/submit", json=request_data).status_code
 
-        threads = [threading.Thread(target=make_request) for _ in range(5)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(make_request, range(5)))
 
         # 所有请求都应该成功
-        assert all(status == 200 for status in results)
+        assert set(results) == {200}